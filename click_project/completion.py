@@ -22,6 +22,14 @@ def startswith(string, incomplete):
     return string.startswith(incomplete)
 
 
+def filter_startswith(candidates, incomplete):
+    """Same as startswith, applied on several candidates at once"""
+    if os.environ.get(CASE_INSENSITIVE_ENV):
+        incomplete = incomplete.lower()
+        return [candidate for candidate in candidates if candidate.lower().startswith(incomplete)]
+    return [candidate for candidate in candidates if candidate.startswith(incomplete)]
+
+
 def fnmatch(string, incomplete):
     if os.environ.get(CASE_INSENSITIVE_ENV):
         string = string.lower()
@@ -7,12 +7,11 @@ import functools
 import types
 
 import click
-import six
 from click.utils import make_default_short_help
 
 from click_project.lib import get_tabulate_formats, ParameterType
 from click_project.config import config,  merge_settings
-from click_project.completion import startswith
+from click_project.completion import startswith, filter_startswith as _filter_startswith
 from click_project.log import get_logger
 from click_project.overloads import command, group, option, flag, argument, flow_command, flow_option, flow_argument
 from click_project.flow import flowdepends  # NOQA: F401
@@ -21,6 +20,12 @@ from click_project.core import settings_stores
 LOGGER = get_logger(__name__)
 
 
+# the Conf classes keep their __dict__: all the param_config sharing a name
+# store their parameter in the same instance, so the attribute names are not
+# known when the class is created and cannot be declared in __slots__
+_conf_classes = {}
+
+
 def param_config(name, *args, **kwargs):
     typ = kwargs.pop("typ", object)
     kls = kwargs.pop("kls", option)
@@ -29,19 +34,22 @@ def param_config(name, *args, **kwargs):
         argument: click.core.Argument
     }[kls])
 
-    class Conf(typ):
-        pass
+    Conf = _conf_classes.get(typ)
+    if Conf is None:
+        Conf = _conf_classes[typ] = type("Conf", (typ,), {})
     init_callback = kwargs.get("callback")
     if not hasattr(config, name):
         setattr(config, name, Conf())
 
     def _subcommand_config_callback(ctx, attr, value):
-        if not hasattr(config, name):
-            setattr(config, name, Conf())
-        setattr(getattr(config, name), attr.name, value)
+        holder = getattr(config, name, None)
+        if holder is None:
+            holder = Conf()
+            setattr(config, name, holder)
+        setattr(holder, attr.name, value)
         if init_callback is not None:
             value = init_callback(ctx, attr, value)
-            setattr(getattr(config, name), attr.name, value)
+            setattr(holder, attr.name, value)
         return value
 
     kwargs["expose_value"] = kwargs.get("expose_value", False)
@@ -56,12 +64,51 @@ def param_config(name, *args, **kwargs):
     return kls(*args, **kwargs)
 
 
+def _profile_name_to_commandline_name(name):
+    return name.replace("/", "-")
+
+
+def _commandline_name_to_profile_name(name):
+    return name.replace("-", "/")
+
+
+@functools.lru_cache(maxsize=None)
+def _profile_flag_spec(profile_name):
+    profile = _profile_name_to_commandline_name(profile_name)
+    return (
+        ("--" + profile, "profile"),
+        dict(flag_value=profile, help="Consider only the " + profile + " profile"),
+    )
+
+
+def _section_settings(settings, section):
+    """Only keep the given section of the settings to merge"""
+    for s in settings:
+        if section in s:
+            yield {section: s[section]}
+
+
+class _RecipeType(ParameterType):
+    name = "recipe"
+
+    @property
+    def choices(self):
+        return [
+            *(r.short_name for r in config.all_recipes),
+            "main",
+        ]
+
+    def complete(self, ctx, incomplete):
+        return _filter_startswith(self.choices, incomplete)
+
+
 def use_settings(settings_name, settings_cls, override=True, default_profile='context'):
     def decorator(f):
-        if settings_name not in settings_stores:
-            settings_stores[settings_name] = settings_cls()
-        settings_store = settings_stores[settings_name]
+        settings_store = settings_stores.get(settings_name)
+        if settings_store is None:
+            settings_store = settings_stores[settings_name] = settings_cls()
         settings_store.recipe = None
+        settings_store.computed = False
 
         def compute_settings(with_explicit=True):
             settings_store.all_settings = {
@@ -71,6 +118,7 @@ def use_settings(settings_name, settings_cls, override=True, default_profile='co
             }
 
         def setup_settings(ctx):
+            settings_store.computed = False
             if ctx is not None and hasattr(ctx, "click_project_profile"):
                 profile_name = ctx.click_project_profile
             else:
@@ -82,32 +130,38 @@ def use_settings(settings_name, settings_cls, override=True, default_profile='co
             if recipe == "main":
                 recipe = None
             if profile_name == "context":
-                compute_settings(False)
-                s1, s2 = merge_settings(config.iter_settings(
+                s1, s2 = merge_settings(_section_settings(config.iter_settings(
                     recurse=True,
                     only_this_recipe=recipe,
-                ))
+                ), settings_name))
                 profile = config.local_profile or config.global_profile
                 if recipe:
                     profile = profile.get_recipe(recipe)
-                    for r in config.get_enabled_recipes_by_short_name(recipe):
-                        settings_store.all_settings[r.name] = r.get_settings(settings_name)
+                    compute_settings(False)
+                    settings_store.all_settings.update(
+                        (r.name, r.get_settings(settings_name))
+                        for r in config.get_enabled_recipes_by_short_name(recipe)
+                    )
                 else:
                     compute_settings(True)
+                writable = profile.get_settings(settings_name)
                 settings_store.readprofile = profile_name
             else:
                 compute_settings(False)
                 profile = config.get_profile(profile_name)
                 profile = profile.get_recipe(recipe) if recipe else profile
                 settings_store.readprofile = profile_name
-                settings_store.all_settings[profile_name] = profile.get_settings(settings_name)
-                s1, s2 = merge_settings(config.load_settings_from_profile(
+                writable = profile.get_settings(settings_name)
+                settings_store.all_settings[profile_name] = writable
+                s1, s2 = merge_settings(_section_settings(config.load_settings_from_profile(
                     profile,
                     recurse=True,
                     only_this_recipe=recipe,
-                ))
-                for recipe in config.filter_enabled_profiles(profile.recipes):
-                    settings_store.all_settings[recipe.name] = recipe.get_settings(settings_name)
+                ), settings_name))
+                settings_store.all_settings.update(
+                    (r.name, r.get_settings(settings_name))
+                    for r in config.filter_enabled_profiles(profile.recipes)
+                )
 
             readonly = s1 if override else s2
             readonly = readonly.get(settings_name, {})
@@ -116,58 +170,40 @@ def use_settings(settings_name, settings_cls, override=True, default_profile='co
             settings_store.writeprofilename = profile.friendly_name
             settings_store.profile = profile
             settings_store.readonly = readonly
-            settings_store.writable = profile.get_settings(settings_name)
+            settings_store.writable = writable
             settings_store.write = profile.write_settings
+            settings_store.computed = True
 
         def recipe_callback(ctx, attr, value):
             if value is not None:
                 ctx.click_project_recipe = value
                 setup_settings(ctx)
+            elif not settings_store.computed:
+                # the settings are lazily computed the first time a command
+                # using them is parsed, with the default profile and recipe
+                setup_settings(ctx)
             return value
 
-        class RecipeType(ParameterType):
-            @property
-            def choices(self):
-                return [
-                    r.short_name
-                    for r in config.all_recipes
-                ] + ["main"]
-
-            def complete(self, ctx, incomplete):
-                return [
-                    candidate
-                    for candidate in self.choices
-                    if startswith(candidate, incomplete)
-                ]
-
-        def profile_name_to_commandline_name(name):
-            return name.replace("/", "-")
-
-        def commandline_name_to_profile_name(name):
-            return name.replace("-", "/")
-
         def profile_callback(ctx, attr, value):
             if value:
-                ctx.click_project_profile = commandline_name_to_profile_name(value)
+                ctx.click_project_profile = _commandline_name_to_profile_name(value)
                 setup_settings(ctx)
             return value
 
-
-        for profile in [profile_name_to_commandline_name(profile.name) for profile in config.root_profiles]:
-            f = flag('--{}'.format(profile), "profile", flag_value=profile, help="Consider only the {} profile".format(profile), callback=profile_callback)(f)
+        for profile in config.root_profiles:
+            flag_args, flag_kwargs = _profile_flag_spec(profile.name)
+            f = flag(*flag_args, callback=profile_callback, **flag_kwargs)(f)
         f = flag('--context', "profile", flag_value="context", help="Guess the profile", callback=profile_callback)(f)
-        f = option('--recipe', type=RecipeType(), callback=recipe_callback, help="Use this recipe")(f)
-
-        setup_settings(None)
+        f = option('--recipe', type=_RecipeType(), callback=recipe_callback, help="Use this recipe")(f)
 
         @functools.wraps(f)
         def wrapped(*args, **kwargs):
+            if not settings_store.computed:
+                setup_settings(None)
             setattr(config, settings_name, settings_store)
-            del kwargs["recipe"]
-            del kwargs["profile"]
-            LOGGER.debug("Will use the settings at profile {}".format(
-                settings_store.readprofile
-            ))
+            kwargs.pop("recipe", None)
+            kwargs.pop("profile", None)
+            LOGGER.debug("Will use the settings at profile %s", settings_store.readprofile)
             return f(*args, **kwargs)
         wrapped.inherited_params = ["recipe", "profile"]
         return wrapped
@@ -191,17 +227,13 @@ def deprecated(version=None, message=None):
 
 
 def table_format(func=None, default=None, config_name='config.table.format'):
+    def get_default():
+        # resolved lazily, when the option needs it, instead of walking the
+        # settings each time a command is decorated
+        return config.get_settings('values').get(config_name, {}).get('value') or default or 'simple'
+
     def decorator(func):
-        # not sure why, but python can't access the default value with a closure in a statement of this kind
-        #     default = default
-        # so we have to use another name
-        actual_default = config.get_settings('values').get(config_name, {}).get('value') or default or 'simple'
-        opts = [
-            option('--format', default=actual_default, help='Table format', type=get_tabulate_formats()),
-        ]
-        for opt in reversed(opts):
-            func = opt(func)
-        return func
+        return option('--format', default=get_default, help='Table format', type=get_tabulate_formats())(func)
     return decorator(func) if func else decorator
 
 
@@ -213,13 +245,8 @@ def table_fields(func=None, choices=(), default=None):
 
     def decorator(func):
         fields_type = click.Choice(choices) if choices else None
-        opts = [
-            option('--field', 'fields', multiple=True, type=fields_type, default=default,
-                   help="Only display the following fields in the output", callback=callback)
-        ]
-        for opt in reversed(opts):
-            func = opt(func)
-        return func
+        return option('--field', 'fields', multiple=True, type=fields_type, default=default,
+                      help="Only display the following fields in the output", callback=callback)(func)
     return decorator(func) if func else decorator
 
 
@@ -233,7 +260,7 @@ __all__ = ['get_tabulate_formats', 'startswith', 'settings_stores', 'option',
 
 if __name__ == '__main__':
     # generate the __all__ content for this file
-    symbols = [k for k, v in six.iteritems(dict(globals())) if not isinstance(v, types.ModuleType)]
+    symbols = [k for k, v in globals().items() if not isinstance(v, types.ModuleType)]
     symbols = [k for k in symbols if not k.startswith('_')]
     symbols = [k for k in symbols if k not in ['print_function', 'absolute_import']]
     print('__all__ = %s' % repr(symbols))